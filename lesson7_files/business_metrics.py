@@ -7,25 +7,100 @@ including revenue analysis, growth calculations, and customer experience metrics
 
 import pandas as pd
 import numpy as np
-from typing import Tuple, Dict, Any
+from typing import Tuple, Dict, Any, Optional
+
+
+def _check_price_in_cents(sales_data: pd.DataFrame) -> None:
+    """
+    Ensure the price column holds integer cents, as produced by the data loader.
+    
+    Args:
+        sales_data: DataFrame with a 'price' column
+        
+    Raises:
+        TypeError: If price is not an integer dtype (e.g. float dollars)
+    """
+    if not pd.api.types.is_integer_dtype(sales_data['price']):
+        raise TypeError(
+            f"price must be in integer cents, got dtype {sales_data['price'].dtype}; "
+            "load the data with EcommerceDataLoader or convert with "
+            "(price * 100).round().astype('int64')"
+        )
+
+
+def compute_yearly_metrics(sales_data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Calculate revenue, order count and average order value for every year in one pass.
+    
+    Args:
+        sales_data: DataFrame with columns ['order_id', 'price', 'year'], price in integer cents
+        
+    Returns:
+        DataFrame indexed by year with columns ['revenue', 'orders', 'aov'] in dollars
+        
+    Raises:
+        TypeError: If price is not in integer cents
+    """
+    _check_price_in_cents(sales_data)
+    yearly = sales_data.groupby('year', sort=False).agg(revenue=('price', 'sum'))
+    yearly['revenue'] = yearly['revenue'] / 100
+    yearly['orders'] = _count_orders_by_year(sales_data)
+    # Mean of per-order totals equals revenue per distinct order
+    yearly['aov'] = yearly['revenue'] / yearly['orders']
+    return yearly
+
+
+def _count_orders_by_year(sales_data: pd.DataFrame) -> pd.Series:
+    """
+    Count distinct orders per year.
+    
+    Integer order IDs (as factorized by the data loader) are counted with a
+    sort-based np.unique over combined (year, order) keys; other dtypes fall
+    back to groupby nunique.
+    
+    Args:
+        sales_data: DataFrame with columns ['order_id', 'year']
+        
+    Returns:
+        Series of distinct order counts indexed by year
+    """
+    years = sales_data['year']
+    order_ids = sales_data['order_id']
+    if (sales_data.empty or not pd.api.types.is_integer_dtype(years)
+            or not pd.api.types.is_integer_dtype(order_ids)):
+        return sales_data.groupby('year', sort=False)['order_id'].nunique()
+    
+    order_codes = order_ids.to_numpy(dtype=np.int64)
+    offset = order_codes.min()
+    span = order_codes.max() - offset + 1
+    
+    pair_keys = np.unique(years.to_numpy(dtype=np.int64) * span + (order_codes - offset))
+    unique_years, counts = np.unique(pair_keys // span, return_counts=True)
+    return pd.Series(counts, index=pd.Index(unique_years, name='year'))
 
 
 def calculate_revenue_metrics(sales_data: pd.DataFrame, 
                             current_year: int, 
-                            previous_year: int) -> Dict[str, Any]:
+                            previous_year: int,
+                            yearly_metrics: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
     """
     Calculate revenue metrics for current year vs previous year.
     
     Args:
-        sales_data: DataFrame with columns ['price', 'year']
+        sales_data: DataFrame with columns ['order_id', 'price', 'year'], price in integer cents
         current_year: Year to analyze
         previous_year: Year to compare against
+        yearly_metrics: Optional result of compute_yearly_metrics(sales_data), so the
+            yearly aggregation can be shared between metric calls
         
     Returns:
         Dictionary containing revenue metrics
     """
-    current_revenue = sales_data[sales_data['year'] == current_year]['price'].sum()
-    previous_revenue = sales_data[sales_data['year'] == previous_year]['price'].sum()
+    if yearly_metrics is None:
+        yearly_metrics = compute_yearly_metrics(sales_data)
+    revenue_by_year = yearly_metrics['revenue']
+    current_revenue = revenue_by_year.get(current_year, 0)
+    previous_revenue = revenue_by_year.get(previous_year, 0)
     
     if previous_revenue > 0:
         revenue_growth = (current_revenue - previous_revenue) / previous_revenue * 100
@@ -51,28 +126,47 @@ def calculate_monthly_growth(sales_data: pd.DataFrame, year: int) -> pd.Series:
         Series with monthly growth percentages
     """
     year_data = sales_data[sales_data['year'] == year]
-    monthly_revenue = year_data.groupby('month')['price'].sum()
-    return monthly_revenue.pct_change()
+    if not pd.api.types.is_integer_dtype(year_data['month']):
+        return year_data.groupby('month')['price'].sum().pct_change()
+    
+    # Bucket revenue by integer month in a single pass, no hash table needed
+    months = year_data['month'].to_numpy(dtype=np.intp)
+    prices = year_data['price'].to_numpy(dtype=np.float64, na_value=0.0)
+    revenue = np.bincount(months, weights=prices, minlength=13)
+    has_sales = np.bincount(months, minlength=13) > 0
+    
+    # Growth between consecutive months that have sales, as pct_change would report
+    monthly_revenue = revenue[has_sales]
+    growth = np.empty(len(monthly_revenue), dtype=np.float64)
+    growth[:1] = np.nan
+    with np.errstate(divide='ignore', invalid='ignore'):
+        growth[1:] = monthly_revenue[1:] / monthly_revenue[:-1] - 1
+    
+    return pd.Series(growth, index=pd.Index(np.flatnonzero(has_sales), name='month'), name='price')
 
 
 def calculate_average_order_value(sales_data: pd.DataFrame, 
                                 current_year: int, 
-                                previous_year: int) -> Dict[str, Any]:
+                                previous_year: int,
+                                yearly_metrics: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
     """
     Calculate average order value for current year vs previous year.
     
     Args:
-        sales_data: DataFrame with columns ['order_id', 'price', 'year']
+        sales_data: DataFrame with columns ['order_id', 'price', 'year'], price in integer cents
         current_year: Year to analyze
         previous_year: Year to compare against
+        yearly_metrics: Optional result of compute_yearly_metrics(sales_data), so the
+            yearly aggregation can be shared between metric calls
         
     Returns:
         Dictionary containing AOV metrics
     """
-    current_aov = (sales_data[sales_data['year'] == current_year]
-                   .groupby('order_id')['price'].sum().mean())
-    previous_aov = (sales_data[sales_data['year'] == previous_year]
-                    .groupby('order_id')['price'].sum().mean())
+    if yearly_metrics is None:
+        yearly_metrics = compute_yearly_metrics(sales_data)
+    aov_by_year = yearly_metrics['aov']
+    current_aov = aov_by_year.get(current_year, np.nan)
+    previous_aov = aov_by_year.get(previous_year, np.nan)
     
     if previous_aov > 0:
         aov_growth = (current_aov - previous_aov) / previous_aov * 100
@@ -88,20 +182,26 @@ def calculate_average_order_value(sales_data: pd.DataFrame,
 
 def calculate_order_volume_metrics(sales_data: pd.DataFrame, 
                                  current_year: int, 
-                                 previous_year: int) -> Dict[str, Any]:
+                                 previous_year: int,
+                                 yearly_metrics: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
     """
     Calculate order volume metrics for current year vs previous year.
     
     Args:
-        sales_data: DataFrame with columns ['order_id', 'year']
+        sales_data: DataFrame with columns ['order_id', 'price', 'year'], price in integer cents
         current_year: Year to analyze
         previous_year: Year to compare against
+        yearly_metrics: Optional result of compute_yearly_metrics(sales_data), so the
+            yearly aggregation can be shared between metric calls
         
     Returns:
         Dictionary containing order volume metrics
     """
-    current_orders = sales_data[sales_data['year'] == current_year]['order_id'].nunique()
-    previous_orders = sales_data[sales_data['year'] == previous_year]['order_id'].nunique()
+    if yearly_metrics is None:
+        yearly_metrics = compute_yearly_metrics(sales_data)
+    orders_by_year = yearly_metrics['orders']
+    current_orders = int(orders_by_year.get(current_year, 0))
+    previous_orders = int(orders_by_year.get(previous_year, 0))
     
     if previous_orders > 0:
         order_growth = (current_orders - previous_orders) / previous_orders * 100
@@ -115,63 +215,113 @@ def calculate_order_volume_metrics(sales_data: pd.DataFrame,
     }
 
 
+def _performance_table(revenue_cents: pd.Series, item_counts: pd.Series) -> pd.DataFrame:
+    """
+    Build a revenue performance table from per-group integer-cent totals.
+    
+    Totals convert to dollars exactly; only the average is rounded to whole cents.
+    
+    Args:
+        revenue_cents: Revenue per group in integer cents
+        item_counts: Number of line items per group
+        
+    Returns:
+        DataFrame with columns ['total_revenue', 'total_orders', 'avg_order_value'],
+        sorted by revenue
+    """
+    performance = pd.DataFrame({
+        'total_revenue': revenue_cents / 100,
+        'total_orders': item_counts,
+        'avg_order_value': (revenue_cents / item_counts).round() / 100
+    })
+    return performance.sort_values('total_revenue', ascending=False)
+
+
 def calculate_product_category_performance(sales_data: pd.DataFrame, 
-                                         products_data: pd.DataFrame) -> pd.DataFrame:
+                                         products_data: Optional[pd.DataFrame] = None) -> pd.DataFrame:
     """
     Calculate revenue by product category, sorted by performance.
     
     Args:
-        sales_data: DataFrame with columns ['product_id', 'price']
-        products_data: DataFrame with columns ['product_id', 'product_category_name']
+        sales_data: DataFrame with columns ['product_id', 'price'] (integer cents); when
+            products_data is omitted it must already contain 'product_category_name'
+            (e.g. EcommerceDataLoader.get_fact_table())
+        products_data: DataFrame with columns ['product_id', 'product_category_name'];
+            omit to use the category already joined into sales_data
         
     Returns:
         DataFrame with category performance metrics
+        
+    Raises:
+        TypeError: If price is not in integer cents
     """
-    sales_with_categories = pd.merge(
-        sales_data[['product_id', 'price']], 
-        products_data[['product_id', 'product_category_name']],
-        on='product_id'
-    )
-    
-    category_performance = (sales_with_categories
-                           .groupby('product_category_name')['price']
-                           .agg(['sum', 'count', 'mean'])
-                           .round(2))
-    category_performance.columns = ['total_revenue', 'total_orders', 'avg_order_value']
-    
-    return category_performance.sort_values('total_revenue', ascending=False)
+    _check_price_in_cents(sales_data)
+    if products_data is None:
+        sales_with_categories = sales_data[['product_category_name', 'price']]
+    else:
+        sales_with_categories = pd.merge(
+            sales_data[['product_id', 'price']], 
+            products_data[['product_id', 'product_category_name']],
+            on='product_id'
+        )
+    
+    category_totals = (sales_with_categories
+                       .groupby('product_category_name', observed=True, sort=False)['price']
+                       .agg(['sum', 'count']))
+    
+    return _performance_table(category_totals['sum'], category_totals['count'])
 
 
 def calculate_geographic_performance(sales_data: pd.DataFrame,
-                                   orders_data: pd.DataFrame,
-                                   customers_data: pd.DataFrame) -> pd.DataFrame:
+                                   orders_data: Optional[pd.DataFrame] = None,
+                                   customers_data: Optional[pd.DataFrame] = None) -> pd.DataFrame:
     """
     Calculate revenue by geographic region (state).
     
     Args:
-        sales_data: DataFrame with columns ['order_id', 'price']
+        sales_data: DataFrame with columns ['order_id', 'price'] (integer cents); when
+            orders_data and customers_data are omitted it must already contain
+            'customer_state' (e.g. EcommerceDataLoader.get_fact_table())
         orders_data: DataFrame with columns ['order_id', 'customer_id']
         customers_data: DataFrame with columns ['customer_id', 'customer_state']
         
     Returns:
         DataFrame with geographic performance metrics
+        
+    Raises:
+        TypeError: If price is not in integer cents
+        ValueError: If only one of orders_data and customers_data is provided
     """
-    # Merge sales with customer location
-    sales_with_customers = pd.merge(sales_data[['order_id', 'price']], 
-                                   orders_data[['order_id', 'customer_id']], 
-                                   on='order_id')
-    
-    sales_with_states = pd.merge(sales_with_customers, 
-                                customers_data[['customer_id', 'customer_state']], 
-                                on='customer_id')
-    
-    geographic_performance = (sales_with_states
-                             .groupby('customer_state')['price']
-                             .agg(['sum', 'count', 'mean'])
-                             .round(2))
-    geographic_performance.columns = ['total_revenue', 'total_orders', 'avg_order_value']
-    
-    return geographic_performance.sort_values('total_revenue', ascending=False)
+    _check_price_in_cents(sales_data)
+    if (orders_data is None) != (customers_data is None):
+        raise ValueError("orders_data and customers_data must be provided together")
+    
+    if orders_data is None:
+        state_totals = (sales_data
+                        .groupby('customer_state', observed=True, sort=False)['price']
+                        .agg(['sum', 'count']))
+        return _performance_table(state_totals['sum'], state_totals['count'])
+    
+    # Collapse line items to one row per order before joining the dimension tables
+    per_order = (sales_data
+                 .groupby('order_id', sort=False)['price']
+                 .agg(['sum', 'count'])
+                 .reset_index())
+    
+    # Merge per-order revenue with customer location
+    orders_with_customers = pd.merge(per_order, 
+                                    orders_data[['order_id', 'customer_id']], 
+                                    on='order_id')
+    
+    orders_with_states = pd.merge(orders_with_customers, 
+                                 customers_data[['customer_id', 'customer_state']], 
+                                 on='customer_id')
+    
+    state_totals = (orders_with_states
+                    .groupby('customer_state', observed=True, sort=False)[['sum', 'count']]
+                    .sum())
+    
+    return _performance_table(state_totals['sum'], state_totals['count'])
 
 
 def categorize_delivery_speed(days: int) -> str:
@@ -198,28 +348,38 @@ def calculate_customer_experience_metrics(sales_data: pd.DataFrame,
     Calculate customer experience metrics including delivery speed and satisfaction.
     
     Args:
-        sales_data: DataFrame with delivery and order info
+        sales_data: DataFrame with delivery and order info (datetime columns
+            'order_purchase_timestamp' and 'order_delivered_customer_date')
         reviews_data: DataFrame with review scores
         
     Returns:
         Dictionary containing customer experience metrics
     """
-    # Calculate delivery speed
-    sales_data['delivery_speed_days'] = (
-        pd.to_datetime(sales_data['order_delivered_customer_date']) - 
-        pd.to_datetime(sales_data['order_purchase_timestamp'])
-    ).dt.days
+    # Calculate delivery speed (timestamps are already parsed by the data loader);
+    # kept as a local array so the caller's DataFrame is not modified
+    delivery_days = (
+        sales_data['order_delivered_customer_date'] - 
+        sales_data['order_purchase_timestamp']
+    ).dt.days.to_numpy()
     
-    # Merge with reviews
-    sales_with_reviews = pd.merge(sales_data, 
-                                 reviews_data[['order_id', 'review_score']], 
-                                 on='order_id')
+    # Delivery speed depends only on the order, so reduce to one row per order
+    # before joining reviews rather than de-duplicating the joined line items
+    orders_slim = (sales_data[['order_id']]
+                   .assign(delivery_speed_days=delivery_days)
+                   .drop_duplicates('order_id'))
     
-    # Remove duplicates for unique orders
-    unique_orders = sales_with_reviews[['order_id', 'delivery_speed_days', 'review_score']].drop_duplicates()
+    # Merge unique orders with their distinct review scores
+    unique_orders = pd.merge(orders_slim, 
+                            reviews_data[['order_id', 'review_score']].drop_duplicates(), 
+                            on='order_id')
     
-    # Categorize delivery speed
-    unique_orders['delivery_time_category'] = unique_orders['delivery_speed_days'].apply(categorize_delivery_speed)
+    # Categorize delivery speed (vectorized equivalent of categorize_delivery_speed,
+    # which also places orders without a delivery date in '8+ days')
+    unique_orders['delivery_time_category'] = pd.cut(
+        unique_orders['delivery_speed_days'],
+        bins=[-np.inf, 3, 7, np.inf],
+        labels=['1-3 days', '4-7 days', '8+ days']
+    ).fillna('8+ days')
     
     # Calculate metrics
     avg_delivery_days = unique_orders['delivery_speed_days'].mean()
@@ -227,7 +387,7 @@ def calculate_customer_experience_metrics(sales_data: pd.DataFrame,
     
     # Review score by delivery speed
     delivery_satisfaction = (unique_orders
-                           .groupby('delivery_time_category')['review_score']
+                           .groupby('delivery_time_category', observed=True)['review_score']
                            .mean()
                            .round(3))
     
@@ -252,7 +412,11 @@ def calculate_order_status_distribution(orders_data: pd.DataFrame, year: int) ->
     orders_data['year'] = pd.to_datetime(orders_data['order_purchase_timestamp']).dt.year
     year_orders = orders_data[orders_data['year'] == year]
     
-    return year_orders['order_status'].value_counts(normalize=True).round(4)
+    # Categorical statuses report every category; keep only those seen in this year
+    status_counts = year_orders['order_status'].value_counts()
+    status_counts = status_counts[status_counts > 0]
+    
+    return (status_counts / status_counts.sum()).round(4)
 
 
 def generate_business_summary(revenue_metrics: Dict[str, Any],
@@ -6,8 +6,13 @@ from CSV files and preparing it for business analysis.
 """
 
 import pandas as pd
+import numpy as np
 import os
-from typing import Dict, Tuple, Optional, List
+import json
+import pyarrow as pa
+import pyarrow.parquet as pq
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Tuple, Optional, List
 import warnings
 
 warnings.filterwarnings('ignore')
@@ -18,21 +23,42 @@ class EcommerceDataLoader:
     A class to handle loading and preprocessing of e-commerce data.
     """
     
-    def __init__(self, data_path: str = 'ecommerce_data'):
+    # Written into the Parquet fact table metadata; bump whenever the fact table's
+    # columns, dtypes or units change so older cache files are rebuilt
+    FACT_SCHEMA_VERSION = '1'
+    _FACT_SCHEMA_KEY = b'ecommerce_fact_schema_version'
+    _FACT_SOURCE_PATH_KEY = b'ecommerce_fact_source_path'
+    _FACT_SOURCE_FILES_KEY = b'ecommerce_fact_source_files'
+    
+    def __init__(self, 
+                 data_path: str = 'ecommerce_data', 
+                 fact_cache_path: Optional[str] = None):
         """
         Initialize the data loader with path to data directory.
         
         Args:
             data_path: Path to the directory containing CSV files
+            fact_cache_path: Optional Parquet file used to persist the joined
+                fact table across sessions (see get_fact_table)
         """
         self.data_path = data_path
+        self.fact_cache_path = fact_cache_path
         self.raw_data = {}
         self.processed_data = {}
+        self._key_maps = {}
+        self._join_cache = {}
+        self._fact = None
+        self._source_fingerprint = None
         
     def load_raw_data(self) -> Dict[str, pd.DataFrame]:
         """
         Load all raw CSV files into DataFrames.
         
+        The join keys (order_id, customer_id, product_id) are encoded as int32
+        codes shared across all datasets; the original values are kept in
+        self._key_maps. Monetary columns (price, freight_value) are stored as
+        integer cents.
+        
         Returns:
             Dictionary mapping dataset names to DataFrames
         """
@@ -44,20 +70,111 @@ class EcommerceDataLoader:
             'reviews': 'order_reviews_dataset.csv'
         }
         
-        for name, filename in file_mapping.items():
-            filepath = os.path.join(self.data_path, filename)
-            try:
-                self.raw_data[name] = pd.read_csv(filepath)
-                print(f"Loaded {name}: {self.raw_data[name].shape}")
-            except FileNotFoundError:
-                print(f"Warning: {filepath} not found")
+        # Timestamp columns are parsed by the reader instead of in a later pass
+        parse_dates = {
+            'orders': ['order_purchase_timestamp', 'order_approved_at', 'order_delivered_carrier_date',
+                       'order_delivered_customer_date', 'order_estimated_delivery_date'],
+            'order_items': ['shipping_limit_date'],
+            'reviews': ['review_creation_date', 'review_answer_timestamp']
+        }
+        
+        # Low-cardinality labels used as groupby keys are loaded as categoricals,
+        # small-range scores as compact integers
+        dtypes = {
+            'orders': {'order_status': 'category'},
+            'products': {'product_category_name': 'category'},
+            'customers': {'customer_state': 'category', 'customer_city': 'category'},
+            'reviews': {'review_score': 'Int8'}
+        }
+        
+        # Identifies the exact files this load reads, so a persisted fact table
+        # (whose key codes depend on them) is only reused for the same inputs
+        self._source_fingerprint = self._fingerprint_source_files(file_mapping.values())
+        
+        # CSV parsing releases the GIL, so the files are read concurrently
+        with ThreadPoolExecutor(max_workers=len(file_mapping)) as executor:
+            futures = {
+                name: executor.submit(pd.read_csv, os.path.join(self.data_path, filename),
+                                      engine='pyarrow',
+                                      dtype=dtypes.get(name),
+                                      parse_dates=parse_dates.get(name, False))
+                for name, filename in file_mapping.items()
+            }
+            
+            for name, future in futures.items():
+                try:
+                    self.raw_data[name] = future.result()
+                    print(f"Loaded {name}: {self.raw_data[name].shape}")
+                except FileNotFoundError:
+                    print(f"Warning: {os.path.join(self.data_path, file_mapping[name])} not found")
+        
+        self._encode_key_columns()
+        self._convert_money_to_cents()
+        self._join_cache = {}
+        self._fact = None
                 
         return self.raw_data
     
+    def _fingerprint_source_files(self, filenames) -> str:
+        """
+        Describe the CSV files in data_path by name, size and modification time.
+        
+        Args:
+            filenames: CSV file names relative to data_path; missing files are skipped
+            
+        Returns:
+            JSON string listing [name, size, mtime_ns] for each existing file
+        """
+        entries = []
+        for filename in sorted(filenames):
+            path = os.path.join(self.data_path, filename)
+            if os.path.exists(path):
+                stat = os.stat(path)
+                entries.append([filename, stat.st_size, stat.st_mtime_ns])
+        return json.dumps(entries)
+    
+    def _encode_key_columns(self) -> None:
+        """
+        Factorize string join keys into int32 codes consistent across datasets.
+        
+        Merges and groupbys then hash integers instead of variable-length strings.
+        Missing keys are encoded as -1.
+        """
+        self._key_maps = {}
+        for key in ['order_id', 'customer_id', 'product_id']:
+            frames = [df for df in self.raw_data.values() if key in df.columns]
+            if not frames:
+                continue
+            
+            codes, uniques = pd.factorize(pd.concat([df[key] for df in frames], ignore_index=True))
+            self._key_maps[key] = uniques
+            
+            offset = 0
+            for df in frames:
+                df[key] = codes[offset:offset + len(df)].astype(np.int32)
+                offset += len(df)
+    
+    def _convert_money_to_cents(self) -> None:
+        """
+        Store price and freight_value as integer cents so sums are exact.
+        
+        Columns with missing values use the nullable Int64 dtype.
+        """
+        if 'order_items' not in self.raw_data:
+            return
+        
+        order_items = self.raw_data['order_items']
+        for col in ['price', 'freight_value']:
+            if col in order_items.columns:
+                cents = (order_items[col] * 100).round()
+                order_items[col] = cents.astype('int64' if cents.notna().all() else 'Int64')
+    
     def clean_datetime_columns(self, df: pd.DataFrame, datetime_cols: List[str]) -> pd.DataFrame:
         """
         Convert specified columns to datetime format.
         
+        Columns already parsed as datetime (e.g. by load_raw_data) are left as is.
+        
         Args:
             df: DataFrame to process
             datetime_cols: List of column names to convert
@@ -65,9 +182,9 @@ class EcommerceDataLoader:
         Returns:
             DataFrame with converted datetime columns
         """
-        df_copy = df.copy()
+        df_copy = df.copy(deep=False)
         for col in datetime_cols:
-            if col in df_copy.columns:
+            if col in df_copy.columns and not pd.api.types.is_datetime64_any_dtype(df_copy[col]):
                 df_copy[col] = pd.to_datetime(df_copy[col], errors='coerce')
         return df_copy
     
@@ -82,12 +199,20 @@ class EcommerceDataLoader:
         Returns:
             DataFrame with additional time feature columns
         """
-        df_copy = df.copy()
+        df_copy = df.copy(deep=False)
         if timestamp_col in df_copy.columns:
-            df_copy['year'] = df_copy[timestamp_col].dt.year
-            df_copy['month'] = df_copy[timestamp_col].dt.month
-            df_copy['day_of_week'] = df_copy[timestamp_col].dt.dayofweek
-            df_copy['quarter'] = df_copy[timestamp_col].dt.quarter
+            timestamps = df_copy[timestamp_col].dt
+            features = {
+                'year': (timestamps.year, 'int16'),
+                'month': (timestamps.month, 'int8'),
+                'day_of_week': (timestamps.dayofweek, 'int8'),
+                'quarter': (timestamps.quarter, 'int8')
+            }
+            
+            # Missing timestamps yield float NaN features, which cannot be downcast
+            compact = df_copy[timestamp_col].notna().all()
+            for name, (values, dtype) in features.items():
+                df_copy[name] = values.astype(dtype) if compact else values
         return df_copy
     
     def prepare_sales_data(self, 
@@ -113,7 +238,9 @@ class EcommerceDataLoader:
         )
         
         # Filter by order status
-        sales_data = sales_data[sales_data['order_status'].isin(order_status_filter)]
+        sales_data = sales_data[sales_data['order_status'].isin(order_status_filter)].copy()
+        if isinstance(sales_data['order_status'].dtype, pd.CategoricalDtype):
+            sales_data['order_status'] = sales_data['order_status'].cat.remove_unused_categories()
         
         # Clean datetime columns
         datetime_cols = ['order_purchase_timestamp', 'order_delivered_customer_date', 'order_estimated_delivery_date']
@@ -129,6 +256,9 @@ class EcommerceDataLoader:
                 sales_data['order_purchase_timestamp']
             ).dt.days
         
+        # Keep rows in purchase order so date filters can binary-search the timestamps
+        sales_data = sales_data.sort_values('order_purchase_timestamp', kind='stable', ignore_index=True)
+        
         return sales_data
     
     def filter_by_date_range(self, 
@@ -150,25 +280,60 @@ class EcommerceDataLoader:
             timestamp_col: Name of the timestamp column to filter on
             
         Returns:
-            Filtered DataFrame
+            Filtered copy of the DataFrame
         """
-        df_filtered = df.copy()
+        df_filtered = df
         
         # Filter by date range
-        if start_date:
-            df_filtered = df_filtered[df_filtered[timestamp_col] >= start_date]
-        if end_date:
-            df_filtered = df_filtered[df_filtered[timestamp_col] <= end_date]
+        if start_date or end_date:
+            df_filtered = self._select_range(df_filtered, timestamp_col,
+                                             pd.Timestamp(start_date) if start_date else None,
+                                             pd.Timestamp(end_date) if end_date else None)
         
         # Filter by year
         if year:
-            df_filtered = df_filtered[df_filtered['year'] == year]
+            df_filtered = self._select_range(df_filtered, 'year', year, year)
             
         # Filter by month (requires year to be set)
         if month and year:
-            df_filtered = df_filtered[df_filtered['month'] == month]
+            df_filtered = self._select_range(df_filtered, 'month', month, month)
+        
+        # Sorted input is sliced positionally, which can share data with df
+        return df_filtered.copy()
+    
+    @staticmethod
+    def _select_range(df: pd.DataFrame, 
+                      col: str, 
+                      lower: Optional[Any] = None, 
+                      upper: Optional[Any] = None) -> pd.DataFrame:
+        """
+        Select rows where lower <= df[col] <= upper (either bound may be None).
+        
+        When the column is sorted (as in prepare_sales_data output) the bounds are
+        located with two binary searches and a positional slice; otherwise a
+        boolean mask is used. The result may be a view of df.
         
-        return df_filtered
+        Args:
+            df: DataFrame to filter
+            col: Name of the column to compare
+            lower: Inclusive lower bound
+            upper: Inclusive upper bound
+            
+        Returns:
+            Filtered DataFrame
+        """
+        values = df[col]
+        if values.is_monotonic_increasing:
+            start = values.searchsorted(lower, side='left') if lower is not None else 0
+            stop = values.searchsorted(upper, side='right') if upper is not None else len(df)
+            return df.iloc[start:stop]
+        
+        mask = pd.Series(True, index=df.index)
+        if lower is not None:
+            mask &= values >= lower
+        if upper is not None:
+            mask &= values <= upper
+        return df[mask]
     
     def get_data_summary(self) -> Dict[str, Dict]:
         """
@@ -199,25 +364,51 @@ class EcommerceDataLoader:
         for name, df in self.raw_data.items():
             dataset_issues = []
             
-            # Check for missing values in key columns
-            if name == 'orders' and df['order_id'].isnull().sum() > 0:
-                dataset_issues.append("Missing order_id values")
-            
-            if name == 'order_items' and df['price'].isnull().sum() > 0:
-                dataset_issues.append("Missing price values")
-                
-            # Check for negative prices
-            if name == 'order_items' and (df['price'] < 0).any():
-                dataset_issues.append("Negative price values found")
+            # Check for missing and duplicate order IDs in orders table
+            if name == 'orders':
+                missing_ids, duplicate_ids = self._count_missing_and_duplicate_keys(df['order_id'])
+                if missing_ids > 0:
+                    dataset_issues.append("Missing order_id values")
+                if duplicate_ids > 0:
+                    dataset_issues.append("Duplicate order IDs found")
             
-            # Check for duplicate order IDs in orders table
-            if name == 'orders' and df['order_id'].duplicated().sum() > 0:
-                dataset_issues.append("Duplicate order IDs found")
+            # Check for missing and negative prices; int64 cents cannot hold missing
+            # values, and min() skips those of the nullable dtype
+            if name == 'order_items':
+                prices = df['price']
+                if prices.hasnans:
+                    dataset_issues.append("Missing price values")
+                min_price = prices.min()
+                if pd.notna(min_price) and min_price < 0:
+                    dataset_issues.append("Negative price values found")
             
             issues[name] = dataset_issues
             
         return issues
     
+    @staticmethod
+    def _count_missing_and_duplicate_keys(keys: pd.Series) -> Tuple[int, int]:
+        """
+        Count missing and duplicated values of a factorized key column in one pass.
+        
+        Columns that are not integer codes (e.g. raw string IDs) fall back to
+        isna() and duplicated().
+        
+        Args:
+            keys: Integer key codes, with missing keys encoded as -1
+            
+        Returns:
+            Tuple of (missing count, duplicate count)
+        """
+        if keys.empty:
+            return 0, 0
+        
+        if not pd.api.types.is_integer_dtype(keys) or keys.hasnans:
+            return int(keys.isna().sum()), int(keys.duplicated().sum())
+        
+        counts = np.bincount(keys.to_numpy(dtype=np.int64) + 1)
+        return int(counts[0]), int(len(keys) - np.count_nonzero(counts))
+    
     def create_analysis_dataset(self, 
                               year: Optional[int] = None,
                               month: Optional[int] = None,
@@ -235,14 +426,111 @@ class EcommerceDataLoader:
             include_reviews: Whether to include review scores
             
         Returns:
-            Comprehensive analysis-ready DataFrame
+            Comprehensive analysis-ready DataFrame, owned by the caller
         """
-        # Start with sales data
-        analysis_df = self.prepare_sales_data()
+        if include_geographic and include_product_info and include_reviews:
+            analysis_df = self._load_fact_table()
+        else:
+            analysis_df = self._build_full_join(include_geographic, include_product_info, include_reviews)
         
-        # Filter by date if specified
+        # Public methods hand out copies so callers cannot modify the memoized join;
+        # filter_by_date_range already returns one, so it is not copied again
         if year or month:
-            analysis_df = self.filter_by_date_range(analysis_df, year=year, month=month)
+            filtered = self.filter_by_date_range(analysis_df, year=year, month=month)
+            filtered.reset_index(drop=True, inplace=True)
+            return filtered
+        
+        return analysis_df.copy()
+    
+    def get_fact_table(self) -> pd.DataFrame:
+        """
+        Return the sales fact table joined with all dimensions, built once per load.
+        
+        The category and geographic metric functions in business_metrics can use its
+        joined columns directly when called without dimension tables. When
+        fact_cache_path is set, the table is also written there as zstd-compressed
+        Parquet, tagged with FACT_SCHEMA_VERSION, the absolute data_path and the
+        name, size and modification time of each source CSV. Later sessions reuse
+        it only while all of these match.
+        
+        Returns:
+            Copy of the fully joined, unfiltered sales DataFrame
+        """
+        return self._load_fact_table().copy()
+    
+    def _load_fact_table(self) -> pd.DataFrame:
+        """
+        Build, or read from fact_cache_path, the memoized fact table.
+        
+        Returns:
+            The shared fact table (not a copy)
+        """
+        if self._fact is not None:
+            return self._fact
+        
+        if self.fact_cache_path and self._is_fact_cache_fresh():
+            self._fact = pd.read_parquet(self.fact_cache_path)
+        else:
+            self._fact = self._build_full_join(True, True, True)
+            if self.fact_cache_path:
+                table = pa.Table.from_pandas(self._fact, preserve_index=False)
+                metadata = {**(table.schema.metadata or {}), **self._fact_cache_metadata()}
+                pq.write_table(table.replace_schema_metadata(metadata), self.fact_cache_path,
+                               compression='zstd')
+        
+        return self._fact
+    
+    def _fact_cache_metadata(self) -> Dict[bytes, bytes]:
+        """
+        Build the Parquet metadata that ties a persisted fact table to this load.
+        
+        Returns:
+            Dictionary with the schema version, absolute data_path and source file fingerprint
+        """
+        return {
+            self._FACT_SCHEMA_KEY: self.FACT_SCHEMA_VERSION.encode(),
+            self._FACT_SOURCE_PATH_KEY: os.path.abspath(self.data_path).encode(),
+            self._FACT_SOURCE_FILES_KEY: (self._source_fingerprint or '').encode()
+        }
+    
+    def _is_fact_cache_fresh(self) -> bool:
+        """
+        Check whether the Parquet fact table was written with the current
+        FACT_SCHEMA_VERSION from the same data_path and source files as this load.
+        
+        Returns:
+            True if the cached fact table can be reused
+        """
+        if self._source_fingerprint is None or not os.path.exists(self.fact_cache_path):
+            return False
+        
+        metadata = pq.read_schema(self.fact_cache_path).metadata or {}
+        return all(metadata.get(key) == value for key, value in self._fact_cache_metadata().items())
+    
+    def _build_full_join(self,
+                         include_geographic: bool,
+                         include_product_info: bool,
+                         include_reviews: bool) -> pd.DataFrame:
+        """
+        Join sales data with the requested dimension tables, memoized per flag combination.
+        
+        The cache is reset whenever load_raw_data runs. Callers must not modify
+        the returned DataFrame in place.
+        
+        Args:
+            include_geographic: Whether to include customer geographic data
+            include_product_info: Whether to include product category information
+            include_reviews: Whether to include review scores
+            
+        Returns:
+            Joined, unfiltered sales DataFrame
+        """
+        cache_key = (include_geographic, include_product_info, include_reviews)
+        if cache_key in self._join_cache:
+            return self._join_cache[cache_key]
+        
+        # Start with sales data
+        analysis_df = self.prepare_sales_data()
         
         # Add product information
         if include_product_info and 'products' in self.raw_data:
@@ -271,6 +559,7 @@ class EcommerceDataLoader:
                 how='left'
             )
         
+        self._join_cache[cache_key] = analysis_df
         return analysis_df
 
 
@@ -298,8 +587,8 @@ def get_data_dictionary() -> Dict[str, Dict[str, str]]:
             'product_id': 'Unique identifier for the product',
             'seller_id': 'Unique identifier for the seller',
             'shipping_limit_date': 'Latest date seller can ship the item',
-            'price': 'Item price in USD',
-            'freight_value': 'Shipping cost for this item in USD'
+            'price': 'Item price in US cents (integer)',
+            'freight_value': 'Shipping cost for this item in US cents (integer)'
         },
         'products': {
             'product_id': 'Unique identifier for each product',